@@ -5,10 +5,16 @@ Streamlit Edition
 A comprehensive commercial insurance claims analysis tool for loss control consultants.
 """
 
+import functools
+import hashlib
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from io import BytesIO
+from pathlib import Path
 
 # Configure page
 st.set_page_config(
@@ -103,17 +109,330 @@ from utils.calculations import (
     calculate_summary, calculate_risk_score, generate_recommendations,
     group_by_dimension, format_currency, format_percent
 )
-from utils.visualizations import (
-    create_loss_cause_chart, create_trend_chart, create_weekday_chart,
-    create_status_pie, create_lob_chart, create_severity_distribution,
-    create_lag_histogram, create_monthly_trend, create_state_map
-)
+
+
+_PARQUET_CACHE_DIR = Path(".cache")
+
+# Bump when load_file or process_claims_data change so stale Parquet
+# files are ignored and pruned
+_PARQUET_CACHE_VERSION = 4
+_PARQUET_CACHE_MAX_FILES = 50
+_PARQUET_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+
+def _upload_key(file_bytes: bytes, filename: str) -> str:
+    """Data key for an upload, derived from its file name and contents."""
+    return hashlib.sha1(filename.encode() + b"\0" + file_bytes).hexdigest()[:16]
+
+
+def _parquet_path(data_key: str) -> Path:
+    """Parquet cache file for a data key under the current cache version."""
+    return _PARQUET_CACHE_DIR / f"v{_PARQUET_CACHE_VERSION}-{data_key}.parquet"
+
+
+def _read_cached_upload(data_key: str):
+    """Read a processed upload back from the Parquet cache, or None."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    path = _parquet_path(data_key)
+    if not path.exists():
+        return None
+    try:
+        table = pq.read_table(path)
+        path.touch()
+        return table.to_pandas(), table.schema.metadata[b'format_type'].decode()
+    except (pa.ArrowException, OSError, KeyError):
+        return None
+
+
+def _load_and_process(data_key: str, file_bytes: bytes, filename: str) -> tuple[pd.DataFrame, str]:
+    """Parse and standardize an uploaded file.
+    
+    Processed uploads are also written to a Parquet file keyed by the cache
+    version and data key so they survive server restarts and in-memory
+    eviction without being re-parsed.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    cached = _read_cached_upload(data_key)
+    if cached is not None:
+        return cached
+    
+    path = _parquet_path(data_key)
+    buffer = BytesIO(file_bytes)
+    buffer.name = filename
+    df, format_type = load_file(buffer)
+    df = process_claims_data(df)
+    
+    # Disk cache is best-effort; mixed-type columns may not convert to Arrow
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'format_type': format_type.encode()
+        })
+        _PARQUET_CACHE_DIR.mkdir(exist_ok=True)
+        pq.write_table(table, tmp_path, compression='zstd')
+        tmp_path.replace(path)
+        _prune_parquet_cache()
+    except (pa.ArrowException, OSError):
+        # Don't leave partially written claims data behind
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+    
+    return df, format_type
+
+
+def _prune_parquet_cache():
+    """Remove stale-version, expired and excess Parquet cache files."""
+    current = f"v{_PARQUET_CACHE_VERSION}-"
+    now = time.time()
+    
+    # Leftover temp files from interrupted writes
+    for path in _PARQUET_CACHE_DIR.glob("*.tmp"):
+        try:
+            if now - path.stat().st_mtime > 3600:
+                path.unlink()
+        except OSError:
+            pass
+    
+    files = []
+    for path in _PARQUET_CACHE_DIR.glob("*.parquet"):
+        try:
+            mtime = path.stat().st_mtime
+            if not path.name.startswith(current) or now - mtime > _PARQUET_CACHE_MAX_AGE:
+                path.unlink()
+            else:
+                files.append((mtime, path))
+        except OSError:
+            pass
+    
+    # Keep only the most recently used files
+    for _, path in sorted(files, reverse=True)[_PARQUET_CACHE_MAX_FILES:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _sample(n: int) -> pd.DataFrame:
+    """Generate and standardize sample claims data."""
+    return process_claims_data(generate_sample_data(n))
+
+
+_SAMPLE_DATA_KEY = "sample-500"
+
+# Upper bound on datasets held in memory across all sessions
+_MAX_DATASETS = 8
+
+
+@st.cache_resource(max_entries=_MAX_DATASETS, ttl=6 * 3600, show_spinner=False)
+def _load_dataset(data_key: str, _file_bytes: bytes = None, _filename: str = None) -> tuple[pd.DataFrame, str]:
+    """Load a dataset once and share it across sessions, keyed by data key.
+    
+    The file arguments are only needed the first time a key is loaded;
+    later lookups pass the key alone and, after eviction, reload the upload
+    from the Parquet cache. Raises KeyError if it is not on disk either.
+    """
+    if data_key == _SAMPLE_DATA_KEY:
+        return _sample(500), "Sample Data"
+    if _file_bytes is None:
+        cached = _read_cached_upload(data_key)
+        if cached is None:
+            raise KeyError(data_key)
+        return cached
+    return _load_and_process(data_key, _file_bytes, _filename)
+
+
+def _dataset(data_key: str) -> pd.DataFrame:
+    """Look up a loaded claims DataFrame by data key."""
+    return _load_dataset(data_key)[0]
+
+
+def get_claims_data():
+    """Return the claims DataFrame for the current session, if loaded.
+    
+    Flags the session when its dataset can no longer be restored so pages
+    can ask for a re-upload.
+    """
+    data_key = st.session_state.data_key
+    if data_key is None:
+        return None
+    try:
+        df = _dataset(data_key)
+    except KeyError:
+        st.session_state.dataset_expired = True
+        return None
+    st.session_state.dataset_expired = False
+    return df
+
+
+def no_data_warning():
+    """Warn that no data is loaded, or that the loaded dataset expired."""
+    if st.session_state.dataset_expired:
+        st.warning("⚠️ Your dataset is no longer cached on the server. Please re-upload the file.")
+    else:
+        st.warning("Please upload data first.")
+
+
+# Cached helpers below are keyed on the data key; the DataFrame is passed
+# as an unhashed argument so Streamlit never hashes the frame and a
+# dataset evicted mid-rerun can't break the page that already holds it.
+
+@st.cache_data(max_entries=_MAX_DATASETS, show_spinner=False)
+def _summary(data_key: str, _df: pd.DataFrame):
+    """Cached claims summary."""
+    return calculate_summary(_df)
+
+
+@st.cache_data(max_entries=_MAX_DATASETS, show_spinner=False)
+def _risk(data_key: str, _df: pd.DataFrame):
+    """Cached risk score."""
+    return calculate_risk_score(_df, _summary(data_key, _df))
+
+
+@st.cache_data(max_entries=_MAX_DATASETS, show_spinner=False)
+def _recs(data_key: str, _df: pd.DataFrame) -> dict:
+    """Cached recommendations with total savings and average ROI."""
+    recs, savings, avg_roi = generate_recommendations(_df, _summary(data_key, _df))
+    return {
+        'items': recs,
+        'total_savings': savings,
+        'avg_roi': avg_roi
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _viz():
+    """Import the Plotly chart builders on first use."""
+    import utils.visualizations as v
+    return v
+
+
+_CHART_BUILDERS = {
+    'loss_cause': 'create_loss_cause_chart',
+    'trend': 'create_trend_chart',
+    'weekday': 'create_weekday_chart',
+    'status_pie': 'create_status_pie',
+    'lob': 'create_lob_chart',
+    'severity_distribution': 'create_severity_distribution',
+    'lag_histogram': 'create_lag_histogram',
+    'monthly_trend': 'create_monthly_trend',
+    'state_map': 'create_state_map',
+}
+
+
+@st.cache_data(ttl=3600, max_entries=len(_CHART_BUILDERS) * _MAX_DATASETS, show_spinner=False)
+def cached_chart(name: str, data_key: str, _df: pd.DataFrame):
+    """Build a Plotly figure by name, reused across reruns."""
+    return getattr(_viz(), _CHART_BUILDERS[name])(_df)
+
+
+@st.cache_data(max_entries=_MAX_DATASETS, show_spinner=False)
+def _group_by(data_key: str, column: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """Cached per-dimension loss breakdown."""
+    return group_by_dimension(_df, column)
+
+
+# Text columns the data table filters on. They are factorized into
+# integer codes on the side; the shared frame keeps its original dtypes
+# because utils.calculations and utils.visualizations also consume it.
+_FACTORIZED_COLUMNS = ['status', 'loss_cause']
+
+
+@st.cache_resource(max_entries=_MAX_DATASETS, show_spinner=False)
+def _factorized(data_key: str, _df: pd.DataFrame) -> dict:
+    """Integer codes and distinct values for the text filter columns."""
+    return {col: pd.factorize(_df[col]) for col in _FACTORIZED_COLUMNS if col in _df}
+
+
+@st.cache_data(max_entries=_MAX_DATASETS, show_spinner=False)
+def _filter_options(data_key: str, _df: pd.DataFrame) -> dict:
+    """Distinct values for the data table filter selectboxes."""
+    df = _df
+    factorized = _factorized(data_key, df)
+    return {
+        'policy_year': sorted(df['policy_year'].dropna().unique().tolist()) if 'policy_year' in df else [],
+        'status': factorized['status'][1].tolist() if 'status' in factorized else [],
+        'loss_cause': sorted(factorized['loss_cause'][1].tolist()) if 'loss_cause' in factorized else []
+    }
+
+
+def _filter_mask(data_key: str, df: pd.DataFrame, filters: tuple) -> np.ndarray:
+    """Fused boolean mask for a tuple of (column, value) equality filters.
+    
+    Text filter columns are compared on their cached integer codes.
+    """
+    factorized = _factorized(data_key, df)
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in filters:
+        if column in factorized:
+            codes, uniques = factorized[column]
+            if value not in uniques:
+                return np.zeros(len(df), dtype=bool)
+            mask &= (codes == uniques.get_loc(value))
+        else:
+            mask &= (df[column].to_numpy() == value)
+    return mask
+
+
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to CSV with pyarrow's C++ CSV writer.
+    
+    Timezone-naive dates and timestamps, booleans and quoting follow
+    DataFrame.to_csv. Known differences from pandas output:
+    
+    - whole-number floats are written without a trailing ".0" (1500, not 1500.0)
+    - timezone-aware timestamps use Arrow's ISO format instead of a "+00:00" offset
+    - sub-second precision is dropped from timestamps that have a time part
+    
+    Falls back to DataFrame.to_csv for frames Arrow can't convert.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    
+    buf = BytesIO()
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for i, field in enumerate(table.schema):
+            col = table.column(i)
+            if pa.types.is_timestamp(field.type) and field.type.tz is None:
+                # Like pandas, drop the time when every value is at midnight
+                if pc.all(pc.equal(col, pc.floor_temporal(col, unit='day'))).as_py() is not False:
+                    col = col.cast(pa.date32(), safe=False)
+                else:
+                    col = pc.strftime(col.cast(pa.timestamp('s'), safe=False), format="%Y-%m-%d %H:%M:%S")
+            elif pa.types.is_boolean(field.type):
+                col = pc.if_else(col, "True", "False")
+            else:
+                continue
+            table = table.set_column(i, field.name, col)
+        pacsv.write_csv(table, buf, pacsv.WriteOptions(quoting_style='needed'))
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+        # Mixed-type object columns can't be converted to Arrow
+        buf = BytesIO()
+        df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+@st.cache_data(max_entries=4 * _MAX_DATASETS, show_spinner=False)
+def _csv_bytes(data_key: str, filters: tuple, _df: pd.DataFrame) -> bytes:
+    """Serialize a dataset, or the caller's filtered slice of it, to CSV.
+    
+    Cached per data key and filter tuple; pass () for the full dataset.
+    """
+    return _to_csv_bytes(_df)
 
 
 def init_session_state():
     """Initialize session state variables."""
-    if 'claims_data' not in st.session_state:
-        st.session_state.claims_data = None
+    if 'data_key' not in st.session_state:
+        st.session_state.data_key = None
     if 'summary' not in st.session_state:
         st.session_state.summary = None
     if 'risk_score' not in st.session_state:
@@ -122,6 +441,10 @@ def init_session_state():
         st.session_state.recommendations = None
     if 'format_type' not in st.session_state:
         st.session_state.format_type = None
+    if 'report_date' not in st.session_state:
+        st.session_state.report_date = None
+    if 'dataset_expired' not in st.session_state:
+        st.session_state.dataset_expired = False
 
 
 def sidebar():
@@ -142,20 +465,18 @@ def sidebar():
         if uploaded_file:
             with st.spinner("Processing file..."):
                 try:
-                    df, format_type = load_file(uploaded_file)
-                    df = process_claims_data(df)
-                    st.session_state.claims_data = df
+                    file_bytes = uploaded_file.getvalue()
+                    data_key = _upload_key(file_bytes, uploaded_file.name)
+                    df, format_type = _load_dataset(data_key, file_bytes, uploaded_file.name)
+                    if st.session_state.data_key != data_key:
+                        st.session_state.report_date = datetime.now().strftime("%B %d, %Y")
+                    st.session_state.data_key = data_key
                     st.session_state.format_type = format_type
                     
                     # Calculate summary and risk
-                    st.session_state.summary = calculate_summary(df)
-                    st.session_state.risk_score = calculate_risk_score(df, st.session_state.summary)
-                    recs, savings, avg_roi = generate_recommendations(df, st.session_state.summary)
-                    st.session_state.recommendations = {
-                        'items': recs,
-                        'total_savings': savings,
-                        'avg_roi': avg_roi
-                    }
+                    st.session_state.summary = _summary(data_key, df)
+                    st.session_state.risk_score = _risk(data_key, df)
+                    st.session_state.recommendations = _recs(data_key, df)
                     
                     st.success(f"✅ Loaded {len(df):,} claims ({format_type})")
                 except Exception as e:
@@ -165,24 +486,19 @@ def sidebar():
         st.markdown("---")
         if st.button("📊 Load Sample Data", use_container_width=True):
             with st.spinner("Generating sample data..."):
-                df = generate_sample_data(500)
-                df = process_claims_data(df)
-                st.session_state.claims_data = df
+                df = _dataset(_SAMPLE_DATA_KEY)
+                st.session_state.data_key = _SAMPLE_DATA_KEY
+                st.session_state.report_date = datetime.now().strftime("%B %d, %Y")
                 st.session_state.format_type = "Sample Data"
                 
-                st.session_state.summary = calculate_summary(df)
-                st.session_state.risk_score = calculate_risk_score(df, st.session_state.summary)
-                recs, savings, avg_roi = generate_recommendations(df, st.session_state.summary)
-                st.session_state.recommendations = {
-                    'items': recs,
-                    'total_savings': savings,
-                    'avg_roi': avg_roi
-                }
+                st.session_state.summary = _summary(_SAMPLE_DATA_KEY, df)
+                st.session_state.risk_score = _risk(_SAMPLE_DATA_KEY, df)
+                st.session_state.recommendations = _recs(_SAMPLE_DATA_KEY, df)
                 
                 st.success("✅ Sample data loaded!")
         
         # Data info
-        if st.session_state.claims_data is not None:
+        if get_claims_data() is not None:
             st.markdown("---")
             st.markdown("#### 📋 Data Summary")
             summary = st.session_state.summary
@@ -204,7 +520,10 @@ def dashboard_page():
     """Render main dashboard."""
     st.title("📊 Dashboard")
     
-    if st.session_state.claims_data is None:
+    df = get_claims_data()
+    if df is None:
+        if st.session_state.dataset_expired:
+            no_data_warning()
         st.info("👆 Upload claims data using the sidebar to get started, or load sample data for a demo.")
         
         # Show feature overview
@@ -235,7 +554,7 @@ def dashboard_page():
             """)
         return
     
-    df = st.session_state.claims_data
+    data_key = st.session_state.data_key
     summary = st.session_state.summary
     risk = st.session_state.risk_score
     
@@ -293,30 +612,31 @@ def dashboard_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(create_loss_cause_chart(df), use_container_width=True)
+        st.plotly_chart(cached_chart('loss_cause', data_key, df), use_container_width=True)
     
     with col2:
-        st.plotly_chart(create_trend_chart(df), use_container_width=True)
+        st.plotly_chart(cached_chart('trend', data_key, df), use_container_width=True)
     
     # Charts row 2
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(create_weekday_chart(df), use_container_width=True)
+        st.plotly_chart(cached_chart('weekday', data_key, df), use_container_width=True)
     
     with col2:
-        st.plotly_chart(create_status_pie(df), use_container_width=True)
+        st.plotly_chart(cached_chart('status_pie', data_key, df), use_container_width=True)
 
 
 def analysis_page():
     """Render detailed analysis page."""
     st.title("🔍 Detailed Analysis")
     
-    if st.session_state.claims_data is None:
-        st.warning("Please upload data first.")
+    df = get_claims_data()
+    if df is None:
+        no_data_warning()
         return
     
-    df = st.session_state.claims_data
+    data_key = st.session_state.data_key
     
     # Analysis tabs
     tab1, tab2, tab3, tab4 = st.tabs(["📈 Trends", "🗺️ Geography", "📊 Distributions", "📋 Data Table"])
@@ -324,16 +644,16 @@ def analysis_page():
     with tab1:
         col1, col2 = st.columns(2)
         with col1:
-            st.plotly_chart(create_monthly_trend(df), use_container_width=True)
+            st.plotly_chart(cached_chart('monthly_trend', data_key, df), use_container_width=True)
         with col2:
-            st.plotly_chart(create_lob_chart(df), use_container_width=True)
+            st.plotly_chart(cached_chart('lob', data_key, df), use_container_width=True)
     
     with tab2:
-        st.plotly_chart(create_state_map(df), use_container_width=True)
+        st.plotly_chart(cached_chart('state_map', data_key, df), use_container_width=True)
         
         # State breakdown table
         if 'state' in df.columns:
-            state_data = group_by_dimension(df, 'state')
+            state_data = _group_by(data_key, 'state', df)
             st.dataframe(
                 state_data.head(10).style.format({
                     'total': '${:,.0f}',
@@ -345,57 +665,83 @@ def analysis_page():
     with tab3:
         col1, col2 = st.columns(2)
         with col1:
-            st.plotly_chart(create_severity_distribution(df), use_container_width=True)
+            st.plotly_chart(cached_chart('severity_distribution', data_key, df), use_container_width=True)
         with col2:
-            st.plotly_chart(create_lag_histogram(df), use_container_width=True)
+            st.plotly_chart(cached_chart('lag_histogram', data_key, df), use_container_width=True)
     
     with tab4:
         # Data table with filters
         st.markdown("### Claims Data")
         
         # Filters
+        opts = _filter_options(data_key, df)
         col1, col2, col3 = st.columns(3)
         with col1:
             if 'policy_year' in df.columns:
-                years = ['All'] + sorted(df['policy_year'].dropna().unique().tolist())
-                selected_year = st.selectbox("Policy Year", years)
+                selected_year = st.selectbox("Policy Year", ['All'] + opts['policy_year'])
         with col2:
             if 'status' in df.columns:
-                statuses = ['All'] + df['status'].dropna().unique().tolist()
-                selected_status = st.selectbox("Status", statuses)
+                selected_status = st.selectbox("Status", ['All'] + opts['status'])
         with col3:
             if 'loss_cause' in df.columns:
-                causes = ['All'] + sorted(df['loss_cause'].dropna().unique().tolist())
-                selected_cause = st.selectbox("Loss Cause", causes)
+                selected_cause = st.selectbox("Loss Cause", ['All'] + opts['loss_cause'])
         
-        # Apply filters
-        filtered_df = df.copy()
+        # Apply filters as a single fused mask
+        filters = []
         if 'policy_year' in df.columns and selected_year != 'All':
-            filtered_df = filtered_df[filtered_df['policy_year'] == selected_year]
+            filters.append(('policy_year', selected_year))
         if 'status' in df.columns and selected_status != 'All':
-            filtered_df = filtered_df[filtered_df['status'] == selected_status]
+            filters.append(('status', selected_status))
         if 'loss_cause' in df.columns and selected_cause != 'All':
-            filtered_df = filtered_df[filtered_df['loss_cause'] == selected_cause]
+            filters.append(('loss_cause', selected_cause))
+        filters = tuple(filters)
+        filtered_df = df
+        if filters:
+            mask = _filter_mask(data_key, df, filters)
+            if not mask.any():
+                st.info("No claims match the selected filters.")
+                return
+            filtered_df = df.iloc[mask]
         
         st.dataframe(filtered_df, use_container_width=True, height=400)
         
         # Download button
-        csv = filtered_df.to_csv(index=False)
         st.download_button(
             "📥 Download Filtered Data",
-            csv,
+            _csv_bytes(data_key, filters, filtered_df),
             "claims_data.csv",
             "text/csv",
             use_container_width=True
         )
 
 
+_PRIORITY_COLORS = {'critical': '#dc2626', 'high': '#f59e0b'}
+
+_REC_CARD_TEMPLATE = """
+<div style="background: white; border-radius: 12px; padding: 20px; margin-bottom: 20px; border-left: 4px solid {border_color};">
+<div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 15px;">
+<h4 style="margin: 0; color: #1e293b;">{strategy_name}</h4>
+<span class="priority-{priority}">{priority_label} PRIORITY</span>
+</div>
+<p style="color: #64748b; margin-bottom: 15px;">
+Addresses: <strong>{cause}</strong> ({frequency} claims, {total_loss} total loss)
+</p>
+<div style="display: flex; gap: 40px; flex-wrap: wrap; color: #1e293b;">
+<div><div style="font-size: 12px; color: #64748b;">IMPLEMENTATION COST</div><div style="font-size: 20px; font-weight: 700;">{implementation_cost}</div></div>
+<div><div style="font-size: 12px; color: #64748b;">POTENTIAL SAVINGS</div><div style="font-size: 20px; font-weight: 700;">{potential_savings}</div></div>
+<div><div style="font-size: 12px; color: #64748b;">ROI</div><div style="font-size: 20px; font-weight: 700;">{roi}</div></div>
+<div><div style="font-size: 12px; color: #64748b;">PAYBACK PERIOD</div><div style="font-size: 20px; font-weight: 700;">{payback_months} months</div></div>
+</div>
+</div>
+"""
+
+
 def risk_control_page():
     """Render risk control recommendations page."""
     st.title("🛡️ Risk Control Recommendations")
     
-    if st.session_state.claims_data is None:
-        st.warning("Please upload data first.")
+    if get_claims_data() is None:
+        no_data_warning()
         return
     
     risk = st.session_state.risk_score
@@ -460,73 +806,79 @@ def risk_control_page():
     if not recs['items']:
         st.info("No specific recommendations generated. Consider implementing general safety improvements.")
     else:
-        for i, rec in enumerate(recs['items'], 1):
-            priority_class = f"priority-{rec.priority}"
+        items = recs['items']
+        rec_df = pd.DataFrame([{
+            'Strategy': r.strategy_name,
+            'Priority': r.priority.upper(),
+            'Loss Cause': r.cause,
+            'Claims': r.frequency,
+            'Total Loss': r.total_loss,
+            'Implementation Cost': r.implementation_cost,
+            'Potential Savings': r.potential_savings,
+            'ROI': r.roi,
+            'Payback Months': r.payback_months
+        } for r in items])
+        
+        currency = st.column_config.NumberColumn(format="$%.0f")
+        st.dataframe(
+            rec_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'Total Loss': currency,
+                'Implementation Cost': currency,
+                'Potential Savings': currency,
+                'ROI': st.column_config.NumberColumn(format="%.0f%%")
+            }
+        )
+        
+        # Details for one recommendation at a time
+        with st.expander("📋 Details"):
+            selected = st.selectbox(
+                "Show details for",
+                range(len(items)),
+                format_func=lambda i: items[i].strategy_name
+            )
+            rec = items[selected]
             
-            with st.container():
-                st.markdown(f"""
-                <div style="background: white; border-radius: 12px; padding: 20px; 
-                            margin-bottom: 20px; border-left: 4px solid 
-                            {'#dc2626' if rec.priority == 'critical' else '#f59e0b' if rec.priority == 'high' else '#3b82f6'};">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 15px;">
-                        <h4 style="margin: 0; color: #1e293b;">{rec.strategy_name}</h4>
-                        <span class="{priority_class}">{rec.priority.upper()} PRIORITY</span>
-                    </div>
-                    <p style="color: #64748b; margin-bottom: 15px;">
-                        Addresses: <strong>{rec.cause}</strong> 
-                        ({rec.frequency} claims, {format_currency(rec.total_loss)} total loss)
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # ROI metrics
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Implementation Cost", format_currency(rec.implementation_cost))
-                with col2:
-                    st.metric("Potential Savings", format_currency(rec.potential_savings))
-                with col3:
-                    st.metric("ROI", f"{rec.roi:.0f}%")
-                with col4:
-                    st.metric("Payback Period", f"{rec.payback_months} months")
-                
-                # Actions
-                with st.expander(f"📋 Implementation Actions"):
-                    for action in rec.actions:
-                        st.markdown(f"→ {action}")
-                    
-                    st.markdown(f"""
-                    ---
-                    **Expected Impact:** {rec.reduction_rate*100:.0f}% reduction potential  
-                    **Confidence:** {'Low' if rec.confidence_factor < 0.7 else 'Moderate' if rec.confidence_factor < 0.9 else 'High'}  
-                    **Net Annual Benefit:** {format_currency(rec.net_benefit)}
-                    """)
-                
-                st.markdown("---")
+            st.markdown(_REC_CARD_TEMPLATE.format(
+                border_color=_PRIORITY_COLORS.get(rec.priority, '#3b82f6'),
+                strategy_name=rec.strategy_name,
+                priority=rec.priority,
+                priority_label=rec.priority.upper(),
+                cause=rec.cause,
+                frequency=rec.frequency,
+                total_loss=format_currency(rec.total_loss),
+                implementation_cost=format_currency(rec.implementation_cost),
+                potential_savings=format_currency(rec.potential_savings),
+                roi=f"{rec.roi:.0f}%",
+                payback_months=rec.payback_months
+            ), unsafe_allow_html=True)
+            
+            st.markdown("**Implementation Actions**")
+            for action in rec.actions:
+                st.markdown(f"→ {action}")
+            
+            st.markdown(f"""
+            ---
+            **Expected Impact:** {rec.reduction_rate*100:.0f}% reduction potential  
+            **Confidence:** {'Low' if rec.confidence_factor < 0.7 else 'Moderate' if rec.confidence_factor < 0.9 else 'High'}  
+            **Net Annual Benefit:** {format_currency(rec.net_benefit)}
+            """)
 
 
-def reports_page():
-    """Render reports and export page."""
-    st.title("📄 Reports & Export")
-    
-    if st.session_state.claims_data is None:
-        st.warning("Please upload data first.")
-        return
-    
-    df = st.session_state.claims_data
-    summary = st.session_state.summary
-    risk = st.session_state.risk_score
-    recs = st.session_state.recommendations
-    
-    st.markdown("### Executive Summary Report")
-    
-    # Generate report content
-    report_date = datetime.now().strftime("%B %d, %Y")
+@st.cache_data(max_entries=_MAX_DATASETS, show_spinner=False)
+def _report_md(data_key: str, fmt: str, report_date: str, _df: pd.DataFrame) -> str:
+    """Build the executive summary report markdown for a dataset."""
+    df = _df
+    summary = _summary(data_key, df)
+    risk = _risk(data_key, df)
+    recs = _recs(data_key, df)
     
     report_md = f"""
 # BerkleyCore Loss Analysis Report
 **Generated:** {report_date}  
-**Data Source:** {st.session_state.format_type}  
+**Data Source:** {fmt}  
 **Analysis Period:** {df['policy_year'].min() if 'policy_year' in df.columns else 'N/A'} - {df['policy_year'].max() if 'policy_year' in df.columns else 'N/A'}
 
 ---
@@ -586,6 +938,43 @@ def reports_page():
 *Report generated by BerkleyCore Loss Analysis Platform v2.0*
 """
     
+    return report_md
+
+
+@st.cache_data(max_entries=_MAX_DATASETS, show_spinner=False)
+def _recs_csv(data_key: str, _df: pd.DataFrame) -> bytes:
+    """Recommendations export as CSV."""
+    recs_data = pd.DataFrame([{
+        'Strategy': r.strategy_name,
+        'Priority': r.priority,
+        'Loss Cause': r.cause,
+        'Frequency': r.frequency,
+        'Total Loss': r.total_loss,
+        'Implementation Cost': r.implementation_cost,
+        'Potential Savings': r.potential_savings,
+        'ROI': f"{r.roi:.0f}%",
+        'Payback Months': r.payback_months
+    } for r in _recs(data_key, _df)['items']])
+    return recs_data.to_csv(index=False).encode()
+
+
+def reports_page():
+    """Render reports and export page."""
+    st.title("📄 Reports & Export")
+    
+    df = get_claims_data()
+    if df is None:
+        no_data_warning()
+        return
+    
+    data_key = st.session_state.data_key
+    recs = st.session_state.recommendations
+    
+    st.markdown("### Executive Summary Report")
+    
+    # Generate report content
+    report_md = _report_md(data_key, st.session_state.format_type, st.session_state.report_date, df)
+    
     st.markdown(report_md)
     
     # Export options
@@ -604,10 +993,9 @@ def reports_page():
         )
     
     with col2:
-        csv_data = df.to_csv(index=False)
         st.download_button(
             "📊 Download Claims Data (CSV)",
-            csv_data,
+            _csv_bytes(data_key, (), df),
             "claims_data.csv",
             "text/csv",
             use_container_width=True
@@ -616,33 +1004,22 @@ def reports_page():
     with col3:
         # Recommendations CSV
         if recs['items']:
-            recs_data = pd.DataFrame([{
-                'Strategy': r.strategy_name,
-                'Priority': r.priority,
-                'Loss Cause': r.cause,
-                'Frequency': r.frequency,
-                'Total Loss': r.total_loss,
-                'Implementation Cost': r.implementation_cost,
-                'Potential Savings': r.potential_savings,
-                'ROI': f"{r.roi:.0f}%",
-                'Payback Months': r.payback_months
-            } for r in recs['items']])
-            
             st.download_button(
                 "💡 Download Recommendations (CSV)",
-                recs_data.to_csv(index=False),
+                _recs_csv(data_key, df),
                 "recommendations.csv",
                 "text/csv",
                 use_container_width=True
             )
 
 
-def main():
-    """Main application entry point."""
-    init_session_state()
-    sidebar()
+@st.fragment
+def page_router():
+    """Render navigation and the selected page.
     
-    # Navigation
+    Runs as a fragment so switching pages reruns only this function, not
+    the sidebar.
+    """
     page = st.radio(
         "Navigation",
         ["📊 Dashboard", "🔍 Analysis", "🛡️ Risk Control", "📄 Reports"],
@@ -662,5 +1039,12 @@ def main():
         reports_page()
 
 
+def main():
+    """Main application entry point."""
+    init_session_state()
+    sidebar()
+    page_router()
+
+
 if __name__ == "__main__":
     main()